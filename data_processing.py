@@ -4,13 +4,15 @@ from __future__ import annotations
 
 import io
 import logging
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Iterable
 
 import polars as pl
 import xlsxwriter
 
-from imgw_client import IMGW_BASE_URL
+from imgw_client import IMGW_BASE_URL, POLISH_DIACRITICS
 
 logger = logging.getLogger(__name__)
 
@@ -53,17 +55,23 @@ API_SOURCES: dict[str, DataSource] = {
     ),
 }
 
-DATA_SOURCES: dict[str, DataSource] = {**ARCHIVAL_SOURCES, **API_SOURCES}
+
+_DIR_PREFIX = "[DIR] "
+_FILE_PREFIX = "[PLIK] "
 
 
 def format_directory(entries: Iterable) -> list[str]:
     """Format directory entries into human-readable labels."""
-    return [f"{'[DIR]' if entry.is_dir else '[PLIK]'} {entry.name}" for entry in entries]
+    return [(_DIR_PREFIX if entry.is_dir else _FILE_PREFIX) + entry.name for entry in entries]
 
 
 def parse_directory_selection(label: str) -> str:
     """Strip directory/file prefix from a formatted entry label."""
-    return label.replace("[DIR]", "").replace("[PLIK]", "").strip()
+    if label.startswith(_DIR_PREFIX):
+        return label[len(_DIR_PREFIX):]
+    if label.startswith(_FILE_PREFIX):
+        return label[len(_FILE_PREFIX):]
+    return label.strip()
 
 
 def chunk_dataframe(df: pl.DataFrame, max_rows: int) -> list[pl.DataFrame]:
@@ -71,42 +79,167 @@ def chunk_dataframe(df: pl.DataFrame, max_rows: int) -> list[pl.DataFrame]:
     if len(df) <= max_rows:
         logger.debug("DataFrame fits in one chunk (%d rows)", len(df))
         return [df]
-    chunks = [df.slice(offset, max_rows) for offset in range(0, len(df), max_rows)]
+    chunks = list(df.iter_slices(n_rows=max_rows))
     logger.debug("Split DataFrame (%d rows) into %d chunks of max %d rows", len(df), len(chunks), max_rows)
     return chunks
 
 
 _EXCEL_MAX_SHEET_NAME_LEN = 31  # Excel limits sheet names to 31 characters
+_EXCEL_CONSTANT_MEMORY_ROWS = 200_000  # above this, stream rows to temp files
+
+
+def _workbook_options(total_rows: int) -> dict:
+    """Choose xlsxwriter options for a workbook holding *total_rows* data rows.
+
+    Large exports use ``constant_memory`` mode, which flushes each row to a
+    temporary file as soon as the next one starts, so xlsxwriter's own cell
+    storage stays flat.  The exporter itself still holds whole sheets as
+    Python rows (see :func:`_prepare_sheet`), so total memory keeps growing
+    with sheet size.  Rows must be written top-to-bottom within a sheet,
+    which :func:`_write_sheet` guarantees.
+
+    Strings are always written literally: cells that only look like formulas
+    or URLs stay text, and ``write()`` skips the per-string pattern checks.
+    """
+    options = {"strings_to_formulas": False, "strings_to_urls": False, "strings_to_numbers": False}
+    if total_rows > _EXCEL_CONSTANT_MEMORY_ROWS:
+        logger.debug("Using constant_memory mode for %d rows", total_rows)
+        return {**options, "constant_memory": True, "tmpdir": tempfile.gettempdir()}
+    return {**options, "in_memory": True}
+
+
+_EXCEL_EPOCH_OFFSET_DAYS = 25568  # 1899-12-31 (Excel day 0) -> 1970-01-01
+_EXCEL_FAKE_LEAP_DAY = 59  # Excel counts 1900-02-29, so later serials shift by one
+_MICROSECONDS_PER_DAY = 86_400_000_000
+
+
+def _temporal_to_excel_serial(df: pl.DataFrame) -> pl.DataFrame:
+    """Convert Date/Datetime columns to Excel serial numbers inside Polars.
+
+    xlsxwriter would otherwise convert each date cell in Python; the values
+    written are the same unformatted serials it produces.  Time zones are
+    dropped (wall-clock time kept) since xlsxwriter rejects aware datetimes.
+    """
+    exprs: list[pl.Expr] = []
+    for name, dtype in df.schema.items():
+        if dtype == pl.Date:
+            days = pl.col(name).cast(pl.Int32).cast(pl.Float64)
+        elif isinstance(dtype, pl.Datetime):
+            column = pl.col(name).dt.replace_time_zone(None) if dtype.time_zone else pl.col(name)
+            days = column.dt.epoch("us").cast(pl.Float64) / _MICROSECONDS_PER_DAY
+        else:
+            continue
+        serial = days + _EXCEL_EPOCH_OFFSET_DAYS
+        exprs.append(
+            pl.when(serial > _EXCEL_FAKE_LEAP_DAY).then(serial + 1).otherwise(serial).alias(name)
+        )
+    return df.with_columns(exprs) if exprs else df
+
+
+@dataclass(frozen=True)
+class _SheetRows:
+    """Sheet contents converted to Python rows, ready for xlsxwriter."""
+    columns: list[str]
+    dtypes: list[pl.DataType]
+    rows: list[tuple]
+
+
+def _prepare_sheet(df: pl.DataFrame) -> _SheetRows:
+    """Convert *df* to Excel-ready Python rows."""
+    df = _temporal_to_excel_serial(df)
+    # rows() materializes all tuples in one Rust call instead of yielding per row
+    return _SheetRows(df.columns, df.dtypes, df.rows())
+
+
+def _write_sheet(workbook: xlsxwriter.Workbook, sheet_name: str, sheet: _SheetRows) -> str:
+    """Write *sheet* with a header row to a new worksheet and return its final name."""
+    safe_name = sheet_name[:_EXCEL_MAX_SHEET_NAME_LEN]
+    worksheet = workbook.add_worksheet(safe_name)
+    worksheet.write_row(0, 0, sheet.columns)
+    # Typed writers skip write()'s per-cell type probe; nulls stay empty cells
+    writers = [
+        worksheet.write_number if dtype.is_numeric()
+        else worksheet.write_string if dtype == pl.String
+        else worksheet.write_boolean if dtype == pl.Boolean
+        else worksheet.write
+        for dtype in sheet.dtypes
+    ]
+    for row_index, row in enumerate(sheet.rows, start=1):
+        for col_index, value in enumerate(row):
+            if value is not None:
+                writers[col_index](row_index, col_index, value)
+    logger.debug("Sheet '%s': wrote %d rows", safe_name, len(sheet.rows))
+    return safe_name
+
+
+def _write_sheets(
+    workbook: xlsxwriter.Workbook,
+    sheet_names: list[str],
+    frames: list[pl.DataFrame],
+) -> None:
+    """Write *frames* to worksheets in order, preparing the next one in a background thread.
+
+    Sheets must be written serially, so only one sheet is prepared ahead.  The
+    written sheet is released before the next prepare starts, so at most two
+    sheets' worth of rows are held in memory at once.  A single sheet has
+    nothing to overlap with and is prepared inline.
+    """
+    if len(frames) == 1:
+        _write_sheet(workbook, sheet_names[0], _prepare_sheet(frames[0]))
+        return
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        upcoming: Future[_SheetRows] = executor.submit(_prepare_sheet, frames[0])
+        for index, sheet_name in enumerate(sheet_names):
+            # Rebinding drops the previously written sheet before the next submit
+            sheet = upcoming.result()
+            if index + 1 < len(frames):
+                upcoming = executor.submit(_prepare_sheet, frames[index + 1])
+            _write_sheet(workbook, sheet_name, sheet)
 
 
 def dataframe_to_excel_bytes(chunks: list[pl.DataFrame], sheet_prefix: str = "Dane") -> bytes:
     """Serialize a list of DataFrame chunks to an Excel workbook in memory."""
     logger.info("Exporting %d sheet(s) to Excel", len(chunks))
     output = io.BytesIO()
-    workbook = xlsxwriter.Workbook(output, {"in_memory": True})
-    for index, chunk in enumerate(chunks, start=1):
-        sheet_name = sheet_prefix if len(chunks) == 1 else f"{sheet_prefix}{index}"
-        worksheet = workbook.add_worksheet(sheet_name[:_EXCEL_MAX_SHEET_NAME_LEN])
-        worksheet.write_row(0, 0, chunk.columns)
-        for row_index, row in enumerate(chunk.iter_rows(), start=1):
-            worksheet.write_row(row_index, 0, row)
-        logger.debug("Sheet '%s': wrote %d rows", sheet_name, len(chunk))
-    workbook.close()
-    output.seek(0)
-    data = output.read()
+    # The context manager closes the workbook (and drops constant_memory temp files) on errors too
+    with xlsxwriter.Workbook(output, _workbook_options(sum(len(chunk) for chunk in chunks))) as workbook:
+        if len(chunks) == 1:
+            sheet_names = [sheet_prefix]
+        else:
+            sheet_names = [f"{sheet_prefix}{index}" for index in range(1, len(chunks) + 1)]
+        _write_sheets(workbook, sheet_names, chunks)
+    data = output.getvalue()
     logger.debug("Excel workbook size: %d bytes", len(data))
     return data
 
 
+def dataframe_to_ipc_bytes(df: pl.DataFrame) -> bytes:
+    """Serialize *df* to a zstd-compressed Arrow IPC (Feather v2) file in memory."""
+    output = io.BytesIO()
+    df.write_ipc(output, compression="zstd")
+    data = output.getvalue()
+    logger.debug("Arrow IPC file size: %d bytes", len(data))
+    return data
+
+
+# Single-pass table: ASCII and Polish upper-case letters map straight to
+# lower-case ASCII, diacritics are stripped and spaces removed.
+_STATION_TRANS = str.maketrans({
+    **{chr(code): chr(code + 32) for code in range(ord("A"), ord("Z") + 1)},
+    **POLISH_DIACRITICS,
+    **{letter.upper(): ascii_letter for letter, ascii_letter in POLISH_DIACRITICS.items()},
+    " ": None,
+})
+
+
 def normalize_station_name(station_name: str) -> str:
     """Lower-case *station_name* and strip Polish diacritics for API queries."""
-    replacements = str.maketrans({
-        "ą": "a", "ć": "c", "ę": "e", "ł": "l", "ń": "n",
-        "ó": "o", "ś": "s", "ż": "z", "ź": "z",
-        "Ą": "A", "Ć": "C", "Ę": "E", "Ł": "L", "Ń": "N",
-        "Ó": "O", "Ś": "S", "Ż": "Z", "Ź": "Z",
-    })
-    return station_name.lower().translate(replacements).replace(" ", "")
+    if station_name.isascii():
+        # Nothing to transliterate; C-level lower/replace beat the dict-driven translate
+        return station_name.lower().replace(" ", "")
+    normalized = station_name.translate(_STATION_TRANS)
+    # isascii() is O(1) in CPython; other scripts still need a full lower()
+    return normalized if normalized.isascii() else normalized.lower()
 
 
 # Hydro API category definitions: (value_column, date_column, display_label)
@@ -119,7 +252,7 @@ HYDRO_API_CATEGORIES: list[tuple[str, str, str]] = [
 ]
 
 # Station metadata columns to include in every category table
-HYDRO_STATION_COLS = ["id_stacji", "stacja", "rzeka", "wojewodztwo"]
+HYDRO_STATION_COLS: tuple[str, ...] = ("id_stacji", "stacja", "rzeka", "wojewodztwo")
 
 # Aggregation interval options: display label -> Polars duration string (None = no aggregation)
 HYDRO_AGGREGATION_INTERVALS: dict[str, str | None] = {
@@ -146,16 +279,23 @@ def split_hydro_api_data(df: pl.DataFrame) -> dict[str, pl.DataFrame]:
         category.
     """
     result: dict[str, pl.DataFrame] = {}
-    station_cols = [c for c in HYDRO_STATION_COLS if c in df.columns]
+    present = frozenset(df.columns)
+    station_cols = [c for c in HYDRO_STATION_COLS if c in present]
 
+    labels: list[str] = []
+    plans: list[pl.LazyFrame] = []
+    source = df.lazy()
     for value_col, date_col, label in HYDRO_API_CATEGORIES:
-        if value_col not in df.columns:
+        if value_col not in present:
             logger.debug("Hydro category '%s': value column '%s' not in DataFrame", label, value_col)
             continue
 
-        keep_cols = station_cols + [c for c in [value_col, date_col] if c in df.columns]
-        category_df = df.select(keep_cols).filter(pl.col(value_col).is_not_null())
+        keep_cols = station_cols + [c for c in (value_col, date_col) if c in present]
+        labels.append(label)
+        plans.append(source.select(keep_cols).filter(pl.col(value_col).is_not_null()))
 
+    # Run all category plans together so Polars can execute them in parallel
+    for label, category_df in zip(labels, pl.collect_all(plans)):
         if len(category_df) > 0:
             result[label] = category_df
             logger.debug("Hydro category '%s': %d rows", label, len(category_df))
@@ -165,6 +305,63 @@ def split_hydro_api_data(df: pl.DataFrame) -> dict[str, pl.DataFrame]:
     return result
 
 
+def _aggregate_hydro_plan(
+    lf: pl.LazyFrame,
+    columns: Iterable[str],
+    date_col: str,
+    value_col: str,
+    interval: str,
+) -> pl.LazyFrame:
+    """Lazy plan averaging *value_col* per station and *interval* bucket."""
+    station_cols = [c for c in HYDRO_STATION_COLS if c in columns]
+
+    # Parsing, casting and truncation share one projection
+    sort_cols = station_cols + [date_col]
+    return (
+        lf.with_columns(
+            pl.col(date_col)
+            .str.strptime(pl.Datetime, "%Y-%m-%d %H:%M:%S", strict=False)
+            .dt.truncate(interval)
+            .alias(date_col),
+            pl.col(value_col).cast(pl.Float64, strict=False).alias(value_col),
+        )
+        .group_by(sort_cols, maintain_order=False)
+        .agg(pl.col(value_col).mean().alias(value_col))
+        .sort(sort_cols)
+    )
+
+
+def _aggregate_hydro_frames(
+    jobs: list[tuple[pl.DataFrame, str, str]],
+    interval: str,
+) -> list[pl.DataFrame]:
+    """Aggregate ``(df, date_col, value_col)`` jobs in one streaming collect.
+
+    Frames missing their date or value column are returned unchanged.
+    """
+    result = [df for df, _, _ in jobs]
+    indices: list[int] = []
+    plans: list[pl.LazyFrame] = []
+    for index, (df, date_col, value_col) in enumerate(jobs):
+        present = frozenset(df.columns)
+        if date_col not in present or value_col not in present:
+            continue
+        indices.append(index)
+        plans.append(_aggregate_hydro_plan(df.lazy(), present, date_col, value_col, interval))
+
+    # collect_all runs the plans in parallel, each on the streaming engine
+    for index, df_agg in zip(indices, pl.collect_all(plans, engine="streaming")):
+        logger.debug(
+            "Aggregated '%s' by interval '%s': %d → %d rows",
+            jobs[index][2],
+            interval,
+            len(result[index]),
+            len(df_agg),
+        )
+        result[index] = df_agg
+    return result
+
+
 def aggregate_hydro_category(
     df: pl.DataFrame,
     date_col: str,
@@ -185,37 +382,32 @@ def aggregate_hydro_category(
     Returns:
         Aggregated DataFrame sorted by station and date.
     """
-    if date_col not in df.columns or value_col not in df.columns:
-        return df
+    return _aggregate_hydro_frames([(df, date_col, value_col)], interval)[0]
 
-    station_cols = [c for c in HYDRO_STATION_COLS if c in df.columns]
 
-    df = df.with_columns(
-        pl.col(date_col)
-        .str.strptime(pl.Datetime, "%Y-%m-%d %H:%M:%S", strict=False)
-        .alias(date_col),
-        pl.col(value_col).cast(pl.Float64, strict=False).alias(value_col),
-    )
+def aggregate_hydro_categories(
+    categories: dict[str, pl.DataFrame],
+    interval: str,
+) -> dict[str, pl.DataFrame]:
+    """Aggregate every category table from :func:`split_hydro_api_data` at once.
 
-    df = df.with_columns(
-        pl.col(date_col).dt.truncate(interval).alias(date_col)
-    )
+    All category plans are collected together with :func:`polars.collect_all`,
+    so Polars runs them in parallel instead of one after another.
 
-    sort_cols = station_cols + [date_col]
-    df_agg = (
-        df.group_by(sort_cols)
-        .agg(pl.col(value_col).mean().alias(value_col))
-        .sort(sort_cols)
-    )
+    Args:
+        categories: Mapping of display label to category DataFrame.
+        interval: Polars duration string, e.g. ``"1d"``, ``"1h"``.
 
-    logger.debug(
-        "Aggregated '%s' by interval '%s': %d → %d rows",
-        value_col,
-        interval,
-        len(df),
-        len(df_agg),
-    )
-    return df_agg
+    Returns:
+        Mapping with the same labels and order; categories missing their
+        value or date column are returned unchanged.
+    """
+    columns_by_label = {
+        label: (date_col, value_col) for value_col, date_col, label in HYDRO_API_CATEGORIES
+    }
+    labels = [label for label in categories if label in columns_by_label]
+    jobs = [(categories[label], *columns_by_label[label]) for label in labels]
+    return {**categories, **dict(zip(labels, _aggregate_hydro_frames(jobs, interval)))}
 
 
 def named_sheets_to_excel_bytes(sheets: dict[str, pl.DataFrame]) -> bytes:
@@ -229,16 +421,8 @@ def named_sheets_to_excel_bytes(sheets: dict[str, pl.DataFrame]) -> bytes:
     """
     logger.info("Exporting %d named sheet(s) to Excel", len(sheets))
     output = io.BytesIO()
-    workbook = xlsxwriter.Workbook(output, {"in_memory": True})
-    for sheet_name, df in sheets.items():
-        safe_name = sheet_name[:_EXCEL_MAX_SHEET_NAME_LEN]
-        worksheet = workbook.add_worksheet(safe_name)
-        worksheet.write_row(0, 0, df.columns)
-        for row_index, row in enumerate(df.iter_rows(), start=1):
-            worksheet.write_row(row_index, 0, row)
-        logger.debug("Sheet '%s': wrote %d rows", safe_name, len(df))
-    workbook.close()
-    output.seek(0)
-    data = output.read()
+    with xlsxwriter.Workbook(output, _workbook_options(sum(len(df) for df in sheets.values()))) as workbook:
+        _write_sheets(workbook, list(sheets), list(sheets.values()))
+    data = output.getvalue()
     logger.debug("Excel workbook size: %d bytes", len(data))
     return data
@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
+import codecs
+import functools
+import gzip
 import io
+import json
 import logging
 import re
 import time
 import zipfile
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Iterable, Iterator, TypeVar
+from urllib.parse import urlparse
 
 import polars as pl
 import requests
+from requests.adapters import HTTPAdapter
 
 IMGW_BASE_URL = "https://danepubliczne.imgw.pl/data/dane_pomiarowo_obserwacyjne/"
 IMGW_API_BASE_URL = "https://danepubliczne.imgw.pl/api/data"
@@ -19,9 +25,51 @@ REQUEST_TIMEOUT = 60
 MAX_RETRIES = 3
 RETRY_BACKOFF_MULTIPLIER = 2
 ALLOWED_HOST = "danepubliczne.imgw.pl"
+_ALLOWED_SCHEMES = frozenset(("http", "https"))
+# The "/" after the host ends the authority, so these prefixes imply a valid URL
+_ALLOWED_URL_PREFIXES = tuple(f"{scheme}://{ALLOWED_HOST}/" for scheme in ("https", "http"))
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 16
+ENCODING_SNIFF_BYTES = 64 * 1024
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+# Zip signatures: local file header, empty archive (end of central directory), spanned archive
+ZIP_SIGNATURES = (b"PK\x03\x04", b"PK\x05\x06", b"PK\x07\x08")
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Table helpers accept eager frames or lazy plans and return the same kind
+FrameT = TypeVar("FrameT", pl.DataFrame, pl.LazyFrame)
 
 logger = logging.getLogger(__name__)
 
+# Shared session keeps connections to the IMGW host alive between requests;
+# retries are handled by download_if_modified, so the adapter itself never retries.
+_SESSION = requests.Session()
+for _prefix in ("https://", "http://"):
+    _SESSION.mount(
+        _prefix,
+        HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0),
+    )
+
+# Lower-case Polish letters and their ASCII replacements, shared with data_processing
+POLISH_DIACRITICS = {
+    "ą": "a",
+    "ć": "c",
+    "ę": "e",
+    "ł": "l",
+    "ń": "n",
+    "ó": "o",
+    "ś": "s",
+    "ż": "z",
+    "ź": "z",
+}
+_NAME_TRANS = str.maketrans(POLISH_DIACRITICS)
+
+# Legend line: column name optionally followed by a field width such as "4" or "8/2"
+_LEGEND_LINE_RE = re.compile(r"^([A-Za-z\u00C0-\u017F].*?)(?:\s+\d+(?:/\d+)?)?$")
+
+# Anchor in an Apache-style directory listing: <a href="...">name</a>
+_DIRECTORY_LINK_RE = re.compile(r'<a href="([^"]+)">([^<]+)</a>')
+
 
 @dataclass(frozen=True)
 class DirectoryEntry:
@@ -30,28 +78,75 @@ class DirectoryEntry:
     is_dir: bool
 
 
+@dataclass(frozen=True)
+class Download:
+    """Downloaded body plus the validators needed to revalidate it later."""
+
+    url: str
+    content: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+
+
 def _validate_imgw_url(url: str) -> None:
     """Raise ValueError when *url* does not target the allowed IMGW host."""
-    from urllib.parse import urlparse
+    if url.startswith(_ALLOWED_URL_PREFIXES):
+        return
     parsed = urlparse(url)
-    if parsed.scheme not in ("http", "https"):
+    if parsed.scheme not in _ALLOWED_SCHEMES:
         raise ValueError(f"URL scheme must be http or https, got: {parsed.scheme!r}")
     if parsed.netloc != ALLOWED_HOST:
         raise ValueError(f"URL host must be {ALLOWED_HOST!r}, got: {parsed.netloc!r}")
 
 
+def _read_body(response: requests.Response) -> bytes:
+    """Read a streamed response body into a single buffer.
+
+    ``response.content`` collects small chunks and joins them, briefly holding
+    the body twice; growing one buffer keeps the peak close to the body size.
+    """
+    buffer = io.BytesIO()
+    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+        buffer.write(chunk)
+    return buffer.getvalue()
+
+
 def download_bytes(url: str) -> bytes:
     """Download content from URL with retry and backoff."""
+    return download_if_modified(url).content
+
+
+def download_if_modified(url: str, previous: Download | None = None) -> Download:
+    """Download *url*, revalidating *previous* with a conditional GET.
+
+    When *previous* carries an ``ETag`` or ``Last-Modified`` validator for the
+    same URL, the request sends ``If-None-Match`` / ``If-Modified-Since`` and a
+    ``304 Not Modified`` answer returns *previous* without transferring the
+    body again.
+    """
     _validate_imgw_url(url)
+    # A download of another URL cannot be revalidated
+    cached = previous if previous is not None and previous.url == url else None
+    headers: dict[str, str] = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
     logger.debug("Downloading URL: %s", url)
     last_error: Exception | None = None
     for attempt in range(MAX_RETRIES):
         try:
-            response = requests.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            size = len(response.content)
-            logger.debug("Downloaded %d bytes from %s", size, url)
-            return response.content
+            with _SESSION.get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True) as response:
+                if cached is not None and response.status_code == 304:
+                    logger.debug("Not modified, reusing %d cached bytes for %s", len(cached.content), url)
+                    return cached
+                response.raise_for_status()
+                content = _read_body(response)
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+            logger.debug("Downloaded %d bytes from %s", len(content), url)
+            return Download(url, content, etag, last_modified)
         except requests.RequestException as exc:
             last_error = exc
             if attempt < MAX_RETRIES - 1:
@@ -74,9 +169,7 @@ def list_directory(url: str) -> list[DirectoryEntry]:
     logger.debug("Listing directory: %s", url)
     html = download_bytes(url).decode("utf-8", errors="ignore")
     entries: list[DirectoryEntry] = []
-    for match in re.finditer(r"<a href=\"([^\"]+)\">([^<]+)</a>", html):
-        href = match.group(1)
-        name = match.group(2)
+    for href, name in _DIRECTORY_LINK_RE.findall(html):
         if name in {"../", ".."}:
             continue
         is_dir = href.endswith("/")
@@ -85,18 +178,59 @@ def list_directory(url: str) -> list[DirectoryEntry]:
     return entries
 
 
+def _iter_zip_entries(data: bytes) -> Iterator[tuple[str, bytes]]:
+    """Yield ``(filename, bytes)`` for each file in a zip archive, one at a time.
+
+    Only the member currently being consumed is held decompressed in memory.
+    """
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            with zf.open(info) as member:
+                yield info.filename, member.read()
+
+
+def list_zip_entries(data: bytes) -> list[str]:
+    """Return the file names stored in a zip archive without decompressing them."""
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        names = [info.filename for info in zf.infolist() if not info.is_dir()]
+    logger.debug("ZIP archive contains %d files: %s", len(names), names)
+    return names
+
+
+def read_zip_entry(data: bytes, name: str) -> bytes:
+    """Decompress a single member *name* from a zip archive."""
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        return zf.read(name)
+
+
 def extract_zip_entries(data: bytes) -> dict[str, bytes]:
     """Extract zip content into a filename -> bytes mapping."""
-    with zipfile.ZipFile(io.BytesIO(data)) as zf:
-        names = [name for name in zf.namelist() if not name.endswith("/")]
-        result = {name: zf.read(name) for name in names}
+    result = dict(_iter_zip_entries(data))
     logger.debug("Extracted %d files from ZIP archive: %s", len(result), list(result.keys()))
     return result
 
 
+def _sniff_encodings(data: bytes) -> tuple[str, ...]:
+    """Return candidate encodings for *data*, most likely first.
+
+    A UTF-8 BOM selects ``utf-8-sig`` outright.  Otherwise only the first
+    ``ENCODING_SNIFF_BYTES`` are validated as UTF-8; when that head is already
+    invalid the full-buffer UTF-8 attempt is skipped.
+    """
+    if data.startswith(codecs.BOM_UTF8):
+        return ("utf-8-sig", "cp1250", "latin1")
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(data[:ENCODING_SNIFF_BYTES], final=False)
+    except UnicodeDecodeError:
+        return ("cp1250", "latin1")
+    return ("utf-8", "cp1250", "latin1")
+
+
 def decode_text(data: bytes) -> str:
     """Decode text using common encodings for IMGW data files."""
-    for encoding in ("utf-8", "cp1250", "latin1"):
+    for encoding in _sniff_encodings(data):
         try:
             text = data.decode(encoding)
             logger.debug("Decoded %d bytes using %s encoding", len(data), encoding)
@@ -115,30 +249,51 @@ def detect_delimiter(sample_line: str) -> str | None:
     return None
 
 
+def _polars_encoding(encoding: str) -> str:
+    """Map a Python codec name to the one Polars parses natively, if any."""
+    return "utf8" if encoding.startswith("utf-8") else encoding
+
+
+def _read_csv(data: bytes, separator: str, encoding: str) -> pl.DataFrame:
+    """Parse CSV *data* with Polars straight from bytes (no intermediate copy)."""
+    return pl.read_csv(
+        data,
+        separator=separator,
+        encoding=encoding,
+        infer_schema_length=1000,
+        truncate_ragged_lines=True,
+        ignore_errors=True,
+        low_memory=False,
+        rechunk=False,
+    )
+
+
 def read_table_from_bytes(data: bytes) -> pl.DataFrame:
-    """Read a table from bytes using a best-effort delimiter detection."""
-    text = decode_text(data)
-    sample_line = next((line for line in text.splitlines() if line.strip()), "")
-    delimiter = detect_delimiter(sample_line)
-    logger.debug("Detected delimiter: %r", delimiter)
-    data_stream = io.BytesIO(data)
-    if delimiter:
-        df = pl.read_csv(
-            data_stream,
-            separator=delimiter,
-            infer_schema_length=1000,
-            truncate_ragged_lines=True,
-            ignore_errors=True,
-        )
+    """Read a table from bytes using a best-effort delimiter detection.
+
+    Only the head of *data* is decoded in Python to detect the delimiter; the
+    full body is parsed by Polars, natively for UTF-8 input.  Gzip-compressed
+    files (``.csv.gz``) are decompressed first.
+    """
+    if data.startswith(_GZIP_MAGIC):
+        data = gzip.decompress(data)
+        logger.debug("Decompressed gzip payload: %d bytes", len(data))
+    encodings = _sniff_encodings(data)
+    head = data[:ENCODING_SNIFF_BYTES].decode(encodings[0], errors="ignore")
+    sample_line = next((line for line in head.splitlines() if line.strip()), "")
+    delimiter = detect_delimiter(sample_line) or " "
+    logger.debug("Detected delimiter: %r, encoding: %s", delimiter, encodings[0])
+    # Same chain as decode_text: the body may not match the sniffed head, and
+    # cp1250 leaves a few bytes undefined, so fall through to latin1
+    for encoding in encodings[:-1]:
+        try:
+            df = _read_csv(data, delimiter, _polars_encoding(encoding))
+            break
+        except (pl.exceptions.ComputeError, UnicodeDecodeError):
+            logger.debug("Parsing as %s failed; trying the next encoding", encoding)
     else:
-        df = pl.read_csv(
-            data_stream,
-            separator=" ",
-            infer_schema_length=1000,
-            truncate_ragged_lines=True,
-            ignore_errors=True,
-        )
-    logger.info("Parsed table: %d rows × %d columns", len(df), len(df.columns))
+        df = _read_csv(data, delimiter, encodings[-1])
+    logger.info("Parsed table: %d rows × %d columns", df.height, df.width)
     return df
 
 
@@ -146,11 +301,10 @@ def parse_info_legend(text: str) -> list[str]:
     """Extract column names from an IMGW info/legend file."""
     columns: list[str] = []
     for line in text.splitlines():
-        line = line.strip()
-        if not line:
+        cleaned = " ".join(line.split())
+        if not cleaned:
             continue
-        cleaned = re.sub(r"\s+", " ", line)
-        match = re.match(r"^([A-Za-z\u00C0-\u017F].*?)(?:\s+\d+(?:/\d+)?)?$", cleaned)
+        match = _LEGEND_LINE_RE.match(cleaned)
         if match:
             name = match.group(1).strip("- ")
             if name:
@@ -159,41 +313,39 @@ def parse_info_legend(text: str) -> list[str]:
     return columns
 
 
-def apply_legend_columns(df: pl.DataFrame, legend_columns: list[str]) -> pl.DataFrame:
+def apply_legend_columns(df: FrameT, legend_columns: list[str]) -> FrameT:
     """Apply legend column names if counts match."""
-    if legend_columns and len(legend_columns) == len(df.columns):
-        logger.debug("Applying %d legend column names to DataFrame", len(legend_columns))
-        return df.rename({old: new for old, new in zip(df.columns, legend_columns)})
-    if legend_columns:
-        logger.warning(
-            "Legend column count (%d) does not match DataFrame column count (%d); skipping rename",
-            len(legend_columns),
-            len(df.columns),
-        )
+    if not legend_columns:
+        return df
+    columns = df.collect_schema().names()
+    if len(legend_columns) == len(columns):
+        mapping = {old: new for old, new in zip(columns, legend_columns) if old != new}
+        if not mapping:
+            return df
+        logger.debug("Applying %d legend column names to DataFrame", len(mapping))
+        return df.rename(mapping)
+    logger.warning(
+        "Legend column count (%d) does not match DataFrame column count (%d); skipping rename",
+        len(legend_columns),
+        len(columns),
+    )
     return df
 
 
+@functools.lru_cache(maxsize=1024)
 def normalize_name(name: str) -> str:
     """Normalize Polish column names for matching."""
-    replacements = str.maketrans(
-        {
-            "ą": "a",
-            "ć": "c",
-            "ę": "e",
-            "ł": "l",
-            "ń": "n",
-            "ó": "o",
-            "ś": "s",
-            "ż": "z",
-            "ź": "z",
-        }
-    )
-    return name.lower().translate(replacements).replace(" ", "")
+    return name.lower().translate(_NAME_TRANS).replace(" ", "")
 
 
-def find_column(df: pl.DataFrame, candidates: Iterable[str]) -> str | None:
-    """Find a column in the DataFrame matching any candidate label."""
-    normalized = {normalize_name(col): col for col in df.columns}
+@functools.lru_cache(maxsize=64)
+def _normalized_columns(columns: tuple[str, ...]) -> dict[str, str]:
+    """Map normalized column names to the original names (cached per column set)."""
+    return {normalize_name(col): col for col in columns}
+
+
+def _match_column(normalized: dict[str, str], candidates: Iterable[str]) -> str | None:
+    """Return the first column whose normalized name matches a candidate."""
     for candidate in candidates:
         key = normalize_name(candidate)
         if key in normalized:
@@ -201,11 +353,28 @@ def find_column(df: pl.DataFrame, candidates: Iterable[str]) -> str | None:
     return None
 
 
-def add_date_column(df: pl.DataFrame) -> pl.DataFrame:
+def find_column(df: pl.DataFrame | pl.LazyFrame, candidates: Iterable[str]) -> str | None:
+    """Find a column in the DataFrame matching any candidate label."""
+    return _match_column(_normalized_columns(tuple(df.collect_schema().names())), candidates)
+
+
+def _normalized_text(column: str) -> pl.Expr:
+    """Expression applying :func:`normalize_name` to every value of *column*."""
+    return (
+        pl.col(column)
+        .cast(pl.Utf8)
+        .str.to_lowercase()
+        .str.replace_many(POLISH_DIACRITICS)
+        .str.replace_all(" ", "", literal=True)
+    )
+
+
+def add_date_column(df: FrameT) -> FrameT:
     """Add a `Data` column when year/month/day fields are present."""
-    year_col = find_column(df, ["Rok", "Rok hydrologiczny"])
-    month_col = find_column(df, ["Miesiac", "Miesiąc", "Miesiac kalendarzowy", "Miesiąc kalendarzowy"])
-    day_col = find_column(df, ["Dzien", "Dzień"])
+    normalized = _normalized_columns(tuple(df.collect_schema().names()))
+    year_col = _match_column(normalized, ["Rok", "Rok hydrologiczny"])
+    month_col = _match_column(normalized, ["Miesiac", "Miesiąc", "Miesiac kalendarzowy", "Miesiąc kalendarzowy"])
+    day_col = _match_column(normalized, ["Dzien", "Dzień"])
     if not year_col or not month_col:
         logger.debug("Date column not added: year_col=%r, month_col=%r", year_col, month_col)
         return df
@@ -220,25 +389,31 @@ def add_date_column(df: pl.DataFrame) -> pl.DataFrame:
     )
 
 
-def filter_by_station(df: pl.DataFrame, station_name: str, candidates: Iterable[str]) -> pl.DataFrame:
-    """Filter rows by station name using a case-insensitive contains."""
-    if not station_name:
+def filter_by_station(df: FrameT, station_name: str, candidates: Iterable[str]) -> FrameT:
+    """Filter rows by station name ignoring case, Polish diacritics and spaces.
+
+    A :class:`polars.LazyFrame` only gets the predicate added to its plan, so
+    row counts are logged for eager frames only.
+    """
+    if not station_name.strip():
         logger.debug("No station filter applied (station_name is empty)")
         return df
     station_col = find_column(df, candidates)
     if not station_col:
         logger.warning("Station column not found in DataFrame (candidates: %s)", list(candidates))
         return df
-    rows_before = len(df)
-    df = df.filter(
-        pl.col(station_col).cast(pl.Utf8).str.contains(station_name, literal=True, case_sensitive=False)
-    )
+    predicate = _normalized_text(station_col).str.contains(normalize_name(station_name), literal=True)
+    if isinstance(df, pl.LazyFrame):
+        logger.info("Station filter '%s' on column '%s' added to lazy plan", station_name, station_col)
+        return df.filter(predicate)
+    rows_before = df.height
+    df = df.filter(predicate)
     logger.info(
         "Station filter '%s' on column '%s': %d → %d rows",
         station_name,
         station_col,
         rows_before,
-        len(df),
+        df.height,
     )
     return df
 
@@ -274,245 +449,51 @@ def parse_api_json_to_dataframe(json_bytes: bytes) -> pl.DataFrame:
     """
     Parse JSON response from IMGW API to Polars DataFrame.
     
+    The API returns UTF-8 JSON (a list of objects or a single object), which
+    Polars parses natively without building intermediate Python dicts.  Other
+    payloads fall back to :func:`_parse_api_json_python`.
+    
     Args:
         json_bytes: JSON response from API as bytes
     
     Returns:
         Polars DataFrame with the data
     """
-    import json
-    
-    text = decode_text(json_bytes)
-    data = json.loads(text)
+    try:
+        df = pl.read_json(json_bytes, infer_schema_length=None)
+    except pl.exceptions.PolarsError as exc:
+        logger.debug("Native JSON parse failed (%s); falling back to json module", exc)
+        return _parse_api_json_python(json_bytes)
     
-    if not data:
+    if df.is_empty():
         logger.warning("API returned empty response")
         return pl.DataFrame()
     
-    # API returns a list of dictionaries
-    if isinstance(data, list):
-        df = pl.DataFrame(data)
-        logger.info("Parsed API JSON: %d records", len(df))
-        return df
-    
-    # If single object, wrap in list
-    if isinstance(data, dict):
-        logger.info("Parsed API JSON: 1 record (single object)")
-        return pl.DataFrame([data])
-    
-    logger.warning("Unexpected API JSON structure: %s", type(data).__name__)
-    return pl.DataFrame()
-
-
-def fetch_synop_data(station_id: int | None = None, station_name: str | None = None) -> pl.DataFrame:
-    """
-    Fetch current synoptic station data from IMGW API.
-    
-    Args:
-        station_id: Optional station ID for filtering
-        station_name: Optional station name for filtering (without Polish diacritics)
-    
-    Returns:
-        DataFrame with synoptic data
-    """
-    json_bytes = fetch_api_data("synop", station_id=station_id, station_name=station_name)
-    return parse_api_json_to_dataframe(json_bytes)
-
-
-def fetch_hydro_data(station_id: int | None = None, station_name: str | None = None) -> pl.DataFrame:
-    """
-    Fetch current hydrological station data from IMGW API.
-    
-    Args:
-        station_id: Optional station ID for filtering
-        station_name: Optional station name for filtering (without Polish diacritics)
-    
-    Returns:
-        DataFrame with hydrological data
-    """
-    json_bytes = fetch_api_data("hydro", station_id=station_id, station_name=station_name)
-    return parse_api_json_to_dataframe(json_bytes)
-
-
-def fetch_meteo_data(station_id: int | None = None, station_name: str | None = None) -> pl.DataFrame:
-    """
-    Fetch current meteorological station data from IMGW API.
-    
-    Args:
-        station_id: Optional station ID for filtering
-        station_name: Optional station name for filtering (without Polish diacritics)
-    
-    Returns:
-        DataFrame with meteorological data
-    """
-    json_bytes = fetch_api_data("meteo", station_id=station_id, station_name=station_name)
-    return parse_api_json_to_dataframe(json_bytes)
-
-
-
-def detect_delimiter(sample_line: str) -> str | None:
-    """Detect CSV delimiter from a sample line."""
-    for delimiter in (";", ",", "\t", "|"):
-        if delimiter in sample_line:
-            return delimiter
-    return None
-
-
-def read_table_from_bytes(data: bytes) -> pl.DataFrame:
-    """Read a table from bytes using a best-effort delimiter detection."""
-    text = decode_text(data)
-    sample_line = next((line for line in text.splitlines() if line.strip()), "")
-    delimiter = detect_delimiter(sample_line)
-    data_stream = io.BytesIO(data)
-    if delimiter:
-        return pl.read_csv(
-            data_stream,
-            separator=delimiter,
-            infer_schema_length=1000,
-            truncate_ragged_lines=True,
-            ignore_errors=True,
-        )
-    return pl.read_csv(
-        data_stream,
-        separator=" ",
-        infer_schema_length=1000,
-        truncate_ragged_lines=True,
-        ignore_errors=True,
-    )
-
-
-def parse_info_legend(text: str) -> list[str]:
-    """Extract column names from an IMGW info/legend file."""
-    columns: list[str] = []
-    for line in text.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        cleaned = re.sub(r"\s+", " ", line)
-        match = re.match(r"^([A-Za-z\u00C0-\u017F].*?)(?:\s+\d+(?:/\d+)?)?$", cleaned)
-        if match:
-            name = match.group(1).strip("- ")
-            if name:
-                columns.append(name)
-    return columns
-
-
-def apply_legend_columns(df: pl.DataFrame, legend_columns: list[str]) -> pl.DataFrame:
-    """Apply legend column names if counts match."""
-    if legend_columns and len(legend_columns) == len(df.columns):
-        return df.rename({old: new for old, new in zip(df.columns, legend_columns)})
+    logger.info("Parsed API JSON: %d records", len(df))
     return df
 
 
-def normalize_name(name: str) -> str:
-    """Normalize Polish column names for matching."""
-    replacements = str.maketrans(
-        {
-            "ą": "a",
-            "ć": "c",
-            "ę": "e",
-            "ł": "l",
-            "ń": "n",
-            "ó": "o",
-            "ś": "s",
-            "ż": "z",
-            "ź": "z",
-        }
-    )
-    return name.lower().translate(replacements).replace(" ", "")
-
-
-def find_column(df: pl.DataFrame, candidates: Iterable[str]) -> str | None:
-    """Find a column in the DataFrame matching any candidate label."""
-    normalized = {normalize_name(col): col for col in df.columns}
-    for candidate in candidates:
-        key = normalize_name(candidate)
-        if key in normalized:
-            return normalized[key]
-    return None
-
-
-def add_date_column(df: pl.DataFrame) -> pl.DataFrame:
-    """Add a `Data` column when year/month/day fields are present."""
-    year_col = find_column(df, ["Rok", "Rok hydrologiczny"])
-    month_col = find_column(df, ["Miesiac", "Miesiąc", "Miesiac kalendarzowy", "Miesiąc kalendarzowy"])
-    day_col = find_column(df, ["Dzien", "Dzień"])
-    if not year_col or not month_col:
-        return df
-    day_value = pl.col(day_col) if day_col else pl.lit(1)
-    return df.with_columns(
-        pl.date(
-            pl.col(year_col).cast(pl.Int32),
-            pl.col(month_col).cast(pl.Int32),
-            day_value.cast(pl.Int32),
-        ).alias("Data")
-    )
-
-
-def filter_by_station(df: pl.DataFrame, station_name: str, candidates: Iterable[str]) -> pl.DataFrame:
-    """Filter rows by station name using a case-insensitive contains."""
-    if not station_name:
-        return df
-    station_col = find_column(df, candidates)
-    if not station_col:
-        return df
-    return df.filter(
-        pl.col(station_col).cast(pl.Utf8).str.contains(station_name, literal=True, case_sensitive=False)
-    )
-
-
-def fetch_api_data(endpoint: str, format_type: str = "json", station_id: int | None = None, station_name: str | None = None) -> bytes:
-    """
-    Fetch data from IMGW API endpoints.
-    
-    Args:
-        endpoint: API endpoint (e.g., 'synop', 'hydro', 'meteo')
-        format_type: Output format ('json', 'xml', 'csv', 'html')
-        station_id: Optional station ID for filtering
-        station_name: Optional station name for filtering (without Polish diacritics)
-    
-    Returns:
-        Response content as bytes
-    """
-    url = f"{IMGW_API_BASE_URL}/{endpoint}"
-    
-    if station_id is not None:
-        url = f"{url}/id/{station_id}"
-    elif station_name is not None:
-        url = f"{url}/station/{station_name}"
-    
-    if format_type != "json":
-        url = f"{url}/format/{format_type}"
-    
-    return download_bytes(url)
-
-
-def parse_api_json_to_dataframe(json_bytes: bytes) -> pl.DataFrame:
-    """
-    Parse JSON response from IMGW API to Polars DataFrame.
-    
-    Args:
-        json_bytes: JSON response from API as bytes
-    
-    Returns:
-        Polars DataFrame with the data
-    """
-    import json
-    
+def _parse_api_json_python(json_bytes: bytes) -> pl.DataFrame:
+    """Parse an API response with the standard json module (non-UTF-8 or odd shapes)."""
     text = decode_text(json_bytes)
     data = json.loads(text)
     
     if not data:
+        logger.warning("API returned empty response")
         return pl.DataFrame()
     
     # API returns a list of dictionaries
     if isinstance(data, list):
-        return pl.DataFrame(data)
+        df = pl.DataFrame(data)
+        logger.info("Parsed API JSON: %d records", len(df))
+        return df
     
     # If single object, wrap in list
     if isinstance(data, dict):
+        logger.info("Parsed API JSON: 1 record (single object)")
         return pl.DataFrame([data])
     
+    logger.warning("Unexpected API JSON structure: %s", type(data).__name__)
     return pl.DataFrame()
 
 
@@ -559,4 +540,3 @@ def fetch_meteo_data(station_id: int | None = None, station_name: str | None = N
     """
     json_bytes = fetch_api_data("meteo", station_id=station_id, station_name=station_name)
     return parse_api_json_to_dataframe(json_bytes)
-
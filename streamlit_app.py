@@ -12,9 +12,10 @@ import streamlit as st
 from data_processing import (
     HYDRO_AGGREGATION_INTERVALS,
     HYDRO_API_CATEGORIES,
-    aggregate_hydro_category,
+    aggregate_hydro_categories,
     chunk_dataframe,
     dataframe_to_excel_bytes,
+    dataframe_to_ipc_bytes,
     named_sheets_to_excel_bytes,
     split_hydro_api_data,
 )
@@ -29,6 +30,66 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _frame_cache_key(df: pl.DataFrame) -> tuple[str, bytes]:
+    """Cache key covering every row in order.
+
+    Streamlit's built-in DataFrame hashing samples large frames, which is not
+    safe for caches that outlive the session.
+    """
+    return str(df.schema), df.hash_rows(seed=0).to_numpy().tobytes()
+
+
+_FRAME_HASH_FUNCS = {pl.DataFrame: _frame_cache_key}
+
+# Export caches are shared by every session; keep only recent results
+_EXPORT_CACHE_TTL_SECONDS = 3600
+
+_HYDRO_INTERVAL_LABELS = tuple(HYDRO_AGGREGATION_INTERVALS)
+
+
+@st.cache_data(show_spinner=False, ttl=_EXPORT_CACHE_TTL_SECONDS, max_entries=4, hash_funcs=_FRAME_HASH_FUNCS)
+def _to_ipc(df: pl.DataFrame) -> bytes:
+    """Arrow IPC bytes for *df*, cached so reruns do not re-serialize."""
+    return dataframe_to_ipc_bytes(df)
+
+
+@st.cache_data(show_spinner=False, persist="disk", max_entries=4, hash_funcs=_FRAME_HASH_FUNCS)
+def _build_excel(df: pl.DataFrame, max_rows: int) -> bytes:
+    """Excel workbook for *df* split into sheets of *max_rows*, cached on disk."""
+    return dataframe_to_excel_bytes(chunk_dataframe(df, max_rows))
+
+
+@st.cache_data(show_spinner=False, persist="disk", max_entries=4, hash_funcs=_FRAME_HASH_FUNCS)
+def _build_named_excel(sheets: dict[str, pl.DataFrame]) -> bytes:
+    """Excel workbook with one named sheet per frame, cached on disk."""
+    return named_sheets_to_excel_bytes(sheets)
+
+
+# Columns whose unique counts are shown in the statistics panel, by group in
+# display order; matching is on the lower-cased column name
+_PRIORITY_GROUPS: dict[str, tuple[str, ...]] = {
+    'stations': ('nazwa stacji', 'nazwa wodowskazu', 'wodowskaz', 'stacja', 'nazwa_stacji'),
+    'rivers': ('rzeka',),
+    'provinces': ('wojewodztwo', 'województwo'),
+}
+_PRIORITY_LOOKUP: dict[str, str] = {
+    column: group for group, columns in _PRIORITY_GROUPS.items() for column in columns
+}
+
+_COLUMN_LABELS: dict[str, str] = {
+    'nazwa stacji': '📍 Stacje',
+    'nazwa wodowskazu': '🌊 Wodowskazy',
+    'wodowskaz': '🌊 Wodowskazy',
+    'stacja': '📍 Stacje',
+    'stacja synoptyczna': '☁️ Stacje synoptyczne',
+    'rzeka': '🌊 Rzeki',
+    'status': '✓ Statusy',
+    'nazwa_stacji': '📍 Stacje',
+    'stacja_id': '🔢 ID stacji',
+    'wojewodztwo': '🗺️ Województwa',
+}
+
+
 def create_data_preview_panel(
     data: pl.DataFrame,
     row_limit: int = 100,
@@ -66,15 +127,19 @@ def create_data_preview_panel(
     """
     
     df = data
+    row_count = df.height
     
     # Validate data
-    if df.is_empty():
+    if row_count == 0:
         st.warning("⚠️ Brak danych do wyświetlenia")
         return
     
-    # Sort data if requested
+    # Sort only the previewed rows: top/bottom-k selects them without a full sort,
+    # statistics below are order-independent and use the whole frame
+    preview = df.head(row_limit)
     if sort_by_column and sort_by_column in df.columns:
-        df = df.sort(sort_by_column, descending=descending)
+        select_k = df.top_k if descending else df.bottom_k
+        preview = select_k(row_limit, by=sort_by_column).sort(sort_by_column, descending=descending)
     
     # Create two-column layout
     col_preview, col_stats = st.columns([3, 1])
@@ -82,8 +147,9 @@ def create_data_preview_panel(
     # LEFT COLUMN: Data Preview Table
     with col_preview:
         st.subheader(title_preview)
+        # An Arrow table is serialized directly; a Polars frame would go through pandas
         st.dataframe(
-            df.head(row_limit),
+            preview.to_arrow(),
             use_container_width=True,
             height=height
         )
@@ -103,7 +169,7 @@ def create_data_preview_panel(
             ]
         
         # Display basic statistics
-        _display_basic_statistics(df, columns_to_analyze)
+        _display_basic_statistics(df, columns_to_analyze, row_count, df.estimated_size("mb"))
         
         # Display time range if date column exists
         if date_column and date_column in df.columns:
@@ -111,51 +177,55 @@ def create_data_preview_panel(
             _display_time_statistics(df, date_column)
     
     # Additional Info Row
-    st.caption(f"Wyświetlonych rekordów: {min(row_limit, len(df))} z {len(df):,}")
+    st.caption(f"Wyświetlonych rekordów: {min(row_limit, row_count)} z {row_count:,}")
 
 
-def _display_basic_statistics(df: pl.DataFrame, columns_to_analyze: list[str]) -> None:
+def _display_basic_statistics(
+    df: pl.DataFrame,
+    columns_to_analyze: list[str],
+    row_count: int,
+    size_mb: float,
+) -> None:
     """Display basic statistics for the given columns."""
     
-    # Create two-column layout for metrics
-    col1, col2 = st.columns(2)
+    # Show unique count for specific important columns: the first matching
+    # column per priority group, found in one pass over the columns
+    chosen: dict[str, str] = {}
+    for col in columns_to_analyze:
+        group = _PRIORITY_LOOKUP.get(col.lower())
+        if group and group not in chosen and df[col].dtype in (pl.Utf8, pl.Categorical):
+            chosen[group] = col
+    selected = [chosen[group] for group in _PRIORITY_GROUPS if group in chosen]
     
-    # Display only essential metrics
-    with col1:
-        st.metric("📊 Rekordy", f"{len(df):,}")
+    # One column: call the Series kernel directly, skipping query planning;
+    # several: one select so Polars scans them in parallel
+    if len(selected) == 1:
+        uniques = {selected[0]: df[selected[0]].n_unique()}
+    elif selected:
+        uniques = df.select([pl.col(col).n_unique() for col in selected]).row(0, named=True)
+    else:
+        uniques = {}
     
-    with col2:
-        st.metric("💾 Rozmiar", f"{df.estimated_size('mb'):.1f} MB")
-    
-    # Show unique count for specific important columns
-    priority_groups = {
-        'stations': ['nazwa stacji', 'nazwa wodowskazu', 'wodowskaz', 'stacja', 'nazwa_stacji'],
-        'rivers': ['rzeka'],
-        'provinces': ['wojewodztwo', 'województwo']
-    }
+    # Essential metrics first, then unique counts, laid out alternately
+    metrics = [
+        ("📊 Rekordy", f"{row_count:,}"),
+        ("💾 Rozmiar", f"{size_mb:.1f} MB"),
+        *((_get_column_label(col), uniques[col]) for col in selected),
+    ]
     
-    shown = set()
-    metrics = []
-    
-    for group_name, priority_columns in priority_groups.items():
-        for col in columns_to_analyze:
-            lower_col = col.lower()
-            if lower_col in priority_columns and col not in shown:
-                if df[col].dtype == pl.Utf8 or df[col].dtype == pl.Categorical:
-                    unique_count = df.select(pl.col(col).n_unique()).item()
-                    col_label = _get_column_label(col)
-                    metrics.append((col_label, unique_count))
-                    shown.add(col)
-                    break  # Show only the first match per group
-    
-    # Display additional metrics in two columns
-    for idx, (label, value) in enumerate(metrics):
-        if idx % 2 == 0:
-            with col1:
-                st.metric(label, value)
-        else:
-            with col2:
-                st.metric(label, value)
+    # Fill each column in a single block
+    col1, col2 = st.columns(2)
+    with col1:
+        for label, value in metrics[0::2]:
+            st.metric(label, value)
+    with col2:
+        for label, value in metrics[1::2]:
+            st.metric(label, value)
+
+
+def _column_min_max(df: pl.DataFrame, column: pl.Expr) -> tuple:
+    """Return ``(min, max)`` of *column*; nulls are skipped, empty gives ``None``."""
+    return df.select(column.min().alias("min_date"), column.max().alias("max_date")).row(0)
 
 
 def _display_time_statistics(df: pl.DataFrame, date_column: str) -> None:
@@ -164,21 +234,19 @@ def _display_time_statistics(df: pl.DataFrame, date_column: str) -> None:
     st.write("**⏱️ Zakres czasowy:**")
     
     try:
-        # Compute min and max dates using Polars to avoid materializing the full column
-        stats = df.select(
-            pl.col(date_column).min().alias("min_date"),
-            pl.col(date_column).max().alias("max_date"),
-        )
-        
-        # If the result is empty, there is no data to show
-        if stats.height == 0:
-            st.caption("Brak danych")
-            return
-        
-        min_date = stats["min_date"][0]
-        max_date = stats["max_date"][0]
+        # One vectorized min/max reduction instead of materializing the column
+        column = pl.col(date_column)
+        if df.schema[date_column] == pl.String:
+            # Text timestamps (API data) are parsed in Polars so they compare
+            # chronologically; formats Polars cannot infer keep the raw text
+            try:
+                min_date, max_date = _column_min_max(df, column.str.to_datetime(strict=False))
+            except pl.exceptions.ComputeError:
+                min_date, max_date = _column_min_max(df, column)
+        else:
+            min_date, max_date = _column_min_max(df, column)
         
-        # Handle cases where all values might be null
+        # Empty or all-null columns reduce to None
         if min_date is None or max_date is None:
             st.caption("Brak danych")
             return
@@ -199,23 +267,9 @@ def _display_time_statistics(df: pl.DataFrame, date_column: str) -> None:
 def _get_column_label(column_name: str) -> str:
     """Convert column name to human-readable Polish label."""
     
-    labels_map = {
-        'nazwa stacji': '📍 Stacje',
-        'nazwa wodowskazu': '🌊 Wodowskazy',
-        'wodowskaz': '🌊 Wodowskazy',
-        'stacja': '📍 Stacje',
-        'stacja synoptyczna': '☁️ Stacje synoptyczne',
-        'rzeka': '🌊 Rzeki',
-        'status': '✓ Statusy',
-        'nazwa_stacji': '📍 Stacje',
-        'stacja_id': '🔢 ID stacji',
-        'wojewodztwo': '🗺️ Województwa',
-    }
-    
-    lower_name = column_name.lower()
-    
-    if lower_name in labels_map:
-        return labels_map[lower_name]
+    label = _COLUMN_LABELS.get(column_name.lower())
+    if label is not None:
+        return label
     
     # Fallback: capitalize and add generic label
     return f"📊 {column_name.capitalize()}"
@@ -225,8 +279,8 @@ def _display_hydro_api_results(df: pl.DataFrame, meta: dict) -> None:
     """Display hydro API data split into category tables with aggregation and Excel export."""
     logger.info(
         "Displaying hydro API results: rows=%d, columns=%d",
-        len(df),
-        len(df.columns),
+        df.height,
+        df.width,
     )
     st.success("Dane przygotowane.")
 
@@ -234,7 +288,7 @@ def _display_hydro_api_results(df: pl.DataFrame, meta: dict) -> None:
     st.subheader("Agregacja danych")
     interval_label = st.selectbox(
         "Przedział agregacji",
-        options=list(HYDRO_AGGREGATION_INTERVALS.keys()),
+        options=_HYDRO_INTERVAL_LABELS,
         key="hydro_api_interval",
     )
     interval = HYDRO_AGGREGATION_INTERVALS[interval_label]
@@ -253,13 +307,10 @@ def _display_hydro_api_results(df: pl.DataFrame, meta: dict) -> None:
         if label in categories
     }
 
-    # Aggregate if requested
-    processed: dict[str, pl.DataFrame] = {}
-    for label, cat_df in categories.items():
-        value_col, date_col = category_meta[label]
-        if interval is not None:
-            cat_df = aggregate_hydro_category(cat_df, date_col, value_col, interval)
-        processed[label] = cat_df
+    # Aggregate if requested; all categories are collected in one parallel pass
+    processed: dict[str, pl.DataFrame] = (
+        aggregate_hydro_categories(categories, interval) if interval is not None else categories
+    )
 
     # Preview each category
     st.subheader("Podgląd kategorii")
@@ -283,15 +334,17 @@ def _display_hydro_api_results(df: pl.DataFrame, meta: dict) -> None:
     freq_label = interval_label.replace(" ", "_").replace("(", "").replace(")", "")
     filename = f"imgw_{source_key}_{freq_label}.xlsx"
 
-    excel_bytes = named_sheets_to_excel_bytes(processed)
+    # Built only once requested; st.download_button needs the bytes up front
+    if st.checkbox("Przygotuj plik Excel", key=f"prepare_excel_{source_key}_hydro_categories"):
+        excel_bytes = _build_named_excel(processed)
 
-    st.download_button(
-        "Pobierz Excel (wszystkie kategorie)",
-        data=excel_bytes,
-        file_name=filename,
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        key=f"download_{source_key}_hydro_categories",
-    )
+        st.download_button(
+            "Pobierz Excel (wszystkie kategorie)",
+            data=excel_bytes,
+            file_name=filename,
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            key=f"download_{source_key}_hydro_categories",
+        )
 
 
 def _display_results(df: pl.DataFrame, meta: dict) -> None:
@@ -304,8 +357,8 @@ def _display_results(df: pl.DataFrame, meta: dict) -> None:
         "Displaying results: source=%s, tab=%s, rows=%d, columns=%d",
         meta.get("source_key"),
         meta.get("tab_id"),
-        len(df),
-        len(df.columns),
+        df.height,
+        df.width,
     )
     st.success("Dane przygotowane.")
 
@@ -324,32 +377,41 @@ def _display_results(df: pl.DataFrame, meta: dict) -> None:
         descending=False,
     )
 
-    st.subheader("Eksport do Excel")
     tab_id = meta.get("tab_id", "")
-    max_rows = st.number_input(
-        "Maksymalna liczba wierszy na arkusz",
-        min_value=50000,
-        max_value=500000,
-        value=200000,
-        step=50000,
-        key=f"max_rows_{meta.get('source_key', 'export')}_{tab_id}",
-    )
-    chunks = chunk_dataframe(df, max_rows)
-    excel_bytes = dataframe_to_excel_bytes(chunks)
-
     frequency = meta.get("frequency")
     source_key = meta.get("source_key", "export")
     freq_label = frequency.replace(" ", "_") if frequency else "api"
-    filename = f"imgw_{source_key}_{freq_label}.xlsx"
+    filename = f"imgw_{source_key}_{freq_label}"
 
+    st.subheader("Eksport danych")
     st.download_button(
-        "Pobierz Excel",
-        data=excel_bytes,
-        file_name=filename,
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        key=f"download_{source_key}_{tab_id}",
+        "Pobierz Feather",
+        data=_to_ipc(df),
+        file_name=f"{filename}.arrow",
+        mime="application/vnd.apache.arrow.file",
+        key=f"download_ipc_{source_key}_{tab_id}",
     )
 
+    with st.expander("Eksport do Excel (wolne)"):
+        max_rows = st.number_input(
+            "Maksymalna liczba wierszy na arkusz",
+            min_value=50000,
+            max_value=500000,
+            value=200000,
+            step=50000,
+            key=f"max_rows_{meta.get('source_key', 'export')}_{tab_id}",
+        )
+        if st.checkbox("Przygotuj plik Excel", key=f"prepare_excel_{source_key}_{tab_id}"):
+            excel_bytes = _build_excel(df, int(max_rows))
+
+            st.download_button(
+                "Pobierz Excel",
+                data=excel_bytes,
+                file_name=f"{filename}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                key=f"download_{source_key}_{tab_id}",
+            )
+
 
 st.set_page_config(page_title="IMGW: raport danych", layout="wide")
 
@@ -13,6 +13,30 @@ from imgw_client import fetch_hydro_data, fetch_meteo_data, fetch_synop_data
 
 logger = logging.getLogger(__name__)
 
+# Operational data refreshes frequently, so API responses are cached briefly.
+_API_CACHE_TTL_SECONDS = 600
+
+# Selectbox options are rebuilt on every rerun otherwise
+_API_SOURCE_KEYS = tuple(API_SOURCES)
+
+
+@st.cache_data(ttl=_API_CACHE_TTL_SECONDS, max_entries=16, show_spinner=False)
+def _cached_fetch_hydro(station_id: int | None, station_name: str | None) -> pl.DataFrame:
+    """Fetch hydrological API data, cached per station filter."""
+    return fetch_hydro_data(station_id=station_id, station_name=station_name)
+
+
+@st.cache_data(ttl=_API_CACHE_TTL_SECONDS, max_entries=16, show_spinner=False)
+def _cached_fetch_synop(station_id: int | None, station_name: str | None) -> pl.DataFrame:
+    """Fetch synoptic API data, cached per station filter."""
+    return fetch_synop_data(station_id=station_id, station_name=station_name)
+
+
+@st.cache_data(ttl=_API_CACHE_TTL_SECONDS, max_entries=16, show_spinner=False)
+def _cached_fetch_meteo(station_id: int | None, station_name: str | None) -> pl.DataFrame:
+    """Fetch meteorological API data, cached per station filter."""
+    return fetch_meteo_data(station_id=station_id, station_name=station_name)
+
 
 def render_api_tab() -> tuple[Optional[pl.DataFrame], dict]:
     """Render the API data tab UI.
@@ -24,7 +48,7 @@ def render_api_tab() -> tuple[Optional[pl.DataFrame], dict]:
     """
     source_key = st.selectbox(
         "Rodzaj danych",
-        options=list(API_SOURCES.keys()),
+        options=_API_SOURCE_KEYS,
         format_func=lambda key: API_SOURCES[key].label,
         key="api_source_key",
     )
@@ -67,20 +91,11 @@ def render_api_tab() -> tuple[Optional[pl.DataFrame], dict]:
         with st.spinner("Pobieranie danych z API IMGW..."):
             try:
                 if source_key == "hydro_api":
-                    df = fetch_hydro_data(
-                        station_id=resolved_station_id,
-                        station_name=resolved_station_name,
-                    )
+                    df = _cached_fetch_hydro(resolved_station_id, resolved_station_name)
                 elif source_key == "synop_api":
-                    df = fetch_synop_data(
-                        station_id=resolved_station_id,
-                        station_name=resolved_station_name,
-                    )
+                    df = _cached_fetch_synop(resolved_station_id, resolved_station_name)
                 elif source_key == "meteo_api":
-                    df = fetch_meteo_data(
-                        station_id=resolved_station_id,
-                        station_name=resolved_station_name,
-                    )
+                    df = _cached_fetch_meteo(resolved_station_id, resolved_station_name)
                 else:
                     logger.error("Unknown API source key: %s", source_key)
                     st.error(f"Nieznane źródło API: {source_key}")
@@ -96,7 +111,7 @@ def render_api_tab() -> tuple[Optional[pl.DataFrame], dict]:
                 st.error(f"Błąd podczas pobierania danych z API: {exc}")
                 return None, {}
 
-        logger.info("API data ready: %d rows × %d columns", len(df), len(df.columns))
+        logger.info("API data ready: %d rows × %d columns", df.height, df.width)
         meta = {"source_key": source_key, "frequency": None, "tab_id": "api"}
         st.session_state["api_cached_df"] = df
         st.session_state["api_cached_meta"] = meta
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import zipfile
 from datetime import date, timedelta
 from typing import Optional
 
@@ -11,19 +12,80 @@ import streamlit as st
 
 from data_processing import ARCHIVAL_SOURCES, format_directory
 from imgw_client import (
+    ZIP_SIGNATURES,
+    DirectoryEntry,
+    Download,
     add_date_column,
     apply_legend_columns,
     decode_text,
-    download_bytes,
-    extract_zip_entries,
+    download_if_modified,
     filter_by_station,
     list_directory,
+    list_zip_entries,
     parse_info_legend,
     read_table_from_bytes,
+    read_zip_entry,
 )
 
 logger = logging.getLogger(__name__)
 
+# Archival files change rarely; keep downloads and parsed tables for an hour.
+_CACHE_TTL_SECONDS = 3600
+
+# Selectbox options are rebuilt on every rerun otherwise
+_ARCHIVAL_SOURCE_KEYS = tuple(ARCHIVAL_SOURCES)
+
+
+@st.cache_data(ttl=_CACHE_TTL_SECONDS, max_entries=16, show_spinner=False)
+def _cached_download(url: str, _previous: Optional[Download] = None) -> Download:
+    """Download *url*, reusing the bytes across reruns and repeated clicks.
+
+    Once the cache entry expires, the session's *_previous* download (not part
+    of the cache key) is revalidated instead of fetched again.
+    """
+    return download_if_modified(url, _previous)
+
+
+@st.cache_data(ttl=_CACHE_TTL_SECONDS, max_entries=32, show_spinner=False)
+def _cached_legend(
+    url: str, _previous: Optional[tuple[Download, list[str]]] = None
+) -> tuple[Download, list[str]]:
+    """Download and parse a legend (info) file once per URL.
+
+    Once the cache entry expires, *_previous* is revalidated and an unchanged
+    legend is not parsed again.
+    """
+    download = download_if_modified(url, _previous[0] if _previous else None)
+    if _previous is not None and download is _previous[0]:
+        return _previous
+    return download, parse_info_legend(decode_text(download.content))
+
+
+@st.cache_data(ttl=_CACHE_TTL_SECONDS, max_entries=32, show_spinner=False)
+def _cached_list_directory(url: str) -> list[DirectoryEntry]:
+    """List a directory once per URL."""
+    return list_directory(url)
+
+
+def _is_zip(raw_bytes: bytes) -> bool:
+    """Return True when *raw_bytes* start with a zip signature."""
+    return raw_bytes.startswith(ZIP_SIGNATURES)
+
+
+@st.cache_data(ttl=_CACHE_TTL_SECONDS, max_entries=16, show_spinner=False)
+def _cached_list_zip(raw_bytes: bytes) -> list[str]:
+    """List zip members once per distinct payload."""
+    return list_zip_entries(raw_bytes)
+
+
+@st.cache_data(ttl=_CACHE_TTL_SECONDS, max_entries=4, show_spinner=False)
+def _cached_read_table(raw_bytes: bytes) -> pl.DataFrame:
+    """Parse a data file once per distinct payload.
+
+    Parsed tables are far larger than the downloads, so only a few are kept.
+    """
+    return read_table_from_bytes(raw_bytes)
+
 
 def render_file_tab() -> tuple[Optional[pl.DataFrame], dict]:
     """Render the archival file-based data tab UI.
@@ -35,7 +97,7 @@ def render_file_tab() -> tuple[Optional[pl.DataFrame], dict]:
     """
     source_key = st.selectbox(
         "Rodzaj danych",
-        options=list(ARCHIVAL_SOURCES.keys()),
+        options=_ARCHIVAL_SOURCE_KEYS,
         format_func=lambda key: ARCHIVAL_SOURCES[key].label,
         key="file_source_key",
     )
@@ -74,12 +136,19 @@ def render_file_tab() -> tuple[Optional[pl.DataFrame], dict]:
 
     legend_columns: list[str] = st.session_state.get("legend_columns", [])
 
+    # Clear processed data when the user switches to a different source type.
+    cached_meta: dict = st.session_state.get("file_cached_meta", {})
+    if cached_meta.get("source_key") != source_key:
+        st.session_state.pop("file_cached_df", None)
+        st.session_state.pop("file_cached_meta", None)
+
     if info_url:
         if st.button("Pobierz legendę", key="file_btn_legend"):
             logger.info("Fetching legend from: %s", info_url)
             try:
-                legend_text = decode_text(download_bytes(info_url))
-                legend_columns = parse_info_legend(legend_text)
+                legend = _cached_legend(info_url, st.session_state.get("file_legend"))
+                legend_columns = legend[1]
+                st.session_state["file_legend"] = legend
                 st.session_state["legend_columns"] = legend_columns
                 if legend_columns:
                     logger.info("Legend loaded: %d columns", len(legend_columns))
@@ -96,7 +165,7 @@ def render_file_tab() -> tuple[Optional[pl.DataFrame], dict]:
     if st.button("Pokaż zawartość katalogu", key="file_btn_dir"):
         logger.info("Listing directory: %s", data_url)
         try:
-            entries = list_directory(data_url)
+            entries = _cached_list_directory(data_url)
             if entries:
                 st.write(format_directory(entries))
             else:
@@ -121,59 +190,98 @@ def render_file_tab() -> tuple[Optional[pl.DataFrame], dict]:
         )
         with st.spinner("Pobieranie pliku..."):
             try:
-                raw_bytes = download_bytes(data_url)
+                download = _cached_download(data_url, st.session_state.get("file_download"))
             except RuntimeError as exc:
                 logger.error("Download failed for %s: %s", data_url, exc)
                 st.error(str(exc))
                 return None, {}
 
-        data_candidates = {"plik": raw_bytes}
-        if raw_bytes[:4] == b"PK\x03\x04":
-            with st.spinner("Rozpakowywanie archiwum..."):
-                data_candidates = extract_zip_entries(raw_bytes)
+        # Only zip member names are listed here; the chosen file is decompressed on
+        # processing.  A plain file has nothing to choose, so it gets no selectbox.
+        raw_bytes = download.content
+        data_candidates: tuple[str, ...] = ()
+        if _is_zip(raw_bytes):
+            try:
+                data_candidates = tuple(_cached_list_zip(raw_bytes))
+            except zipfile.BadZipFile as exc:
+                logger.error("Unreadable ZIP archive from %s: %s", data_url, exc)
+                st.error(f"Nie można odczytać archiwum ZIP: {exc}")
+                return None, {}
+            if not data_candidates:
+                logger.warning("ZIP archive from %s contains no files", data_url)
+                st.warning("Archiwum ZIP nie zawiera plików.")
+                return None, {}
 
-        # Persist available files in session state so they survive reruns
+        # Persist the download and available files in session state so they survive reruns;
+        # results processed from the previous download no longer apply
+        st.session_state.pop("file_cached_df", None)
+        st.session_state.pop("file_cached_meta", None)
+        st.session_state["file_download"] = download
+        st.session_state["file_raw_bytes"] = raw_bytes
         st.session_state["file_data_candidates"] = data_candidates
-        # Initialize default selection if not yet set
-        if "file_selected_name" not in st.session_state and data_candidates:
-            st.session_state["file_selected_name"] = next(iter(data_candidates.keys()))
+        # Default to the first file unless the current selection is still offered
+        if data_candidates and st.session_state.get("file_selected_name") not in data_candidates:
+            st.session_state["file_selected_name"] = data_candidates[0]
 
         st.success("Plik(i) zostały pobrane. Wybierz plik i przetwórz dane poniżej.")
 
     # Render file selection and processing outside the download button block
-    data_candidates = st.session_state.get("file_data_candidates")
-    if data_candidates:
-        selected_name = st.selectbox(
-            "Wybierz plik",
-            options=list(data_candidates.keys()),
-            key="file_selected_name",
-        )
+    if "file_raw_bytes" in st.session_state:
+        data_candidates = st.session_state.get("file_data_candidates", ())
+        selected_name: Optional[str] = None
+        if data_candidates:
+            selected_name = st.selectbox(
+                "Wybierz plik",
+                options=data_candidates,
+                key="file_selected_name",
+            )
 
         if st.button("Przetwórz dane", key="file_btn_process"):
-            if not selected_name:
+            if data_candidates and not selected_name:
                 st.error("Wybierz plik do przetworzenia.")
                 return None, {}
 
-            logger.debug("Processing file: %s", selected_name)
+            logger.debug("Processing file: %s", selected_name or "(plain download)")
             with st.spinner("Przetwarzanie danych..."):
-                df = read_table_from_bytes(data_candidates[selected_name])
-                if legend_columns:
-                    df = apply_legend_columns(df, legend_columns)
-                df = filter_by_station(df, station_name, source.station_candidates)
-                df = add_date_column(df)
+                raw_bytes = st.session_state["file_raw_bytes"]
+                if selected_name:
+                    try:
+                        raw_bytes = read_zip_entry(raw_bytes, selected_name)
+                    except zipfile.BadZipFile as exc:
+                        logger.error("Failed to read %s from ZIP archive: %s", selected_name, exc)
+                        st.error(f"Nie można odczytać pliku {selected_name} z archiwum ZIP: {exc}")
+                        return None, {}
+                # Build one lazy plan so renames, the date column and both
+                # filters run in a single fused pass over the parsed table
+                lf = (
+                    _cached_read_table(raw_bytes)
+                    .lazy()
+                    .pipe(apply_legend_columns, legend_columns)
+                    .pipe(filter_by_station, station_name, source.station_candidates)
+                    .pipe(add_date_column)
+                )
                 if date_range and isinstance(date_range, tuple) and len(date_range) == 2:
                     start_date, end_date = date_range
-                    if "Data" in df.columns:
-                        rows_before = len(df)
-                        df = df.filter(pl.col("Data").is_between(start_date, end_date))
-                        logger.info(
-                            "Date filter %s – %s: %d → %d rows",
-                            start_date,
-                            end_date,
-                            rows_before,
-                            len(df),
+                    if "Data" in lf.collect_schema().names():
+                        logger.info("Date filter %s – %s added to lazy plan", start_date, end_date)
+                        lf = lf.filter(
+                            pl.col("Data").is_between(
+                                pl.lit(start_date, dtype=pl.Date),
+                                pl.lit(end_date, dtype=pl.Date),
+                                closed="both",
+                            )
                         )
+                df = lf.collect(engine="streaming")
+
+            logger.info("Archival data ready: %d rows × %d columns", df.height, df.width)
+            meta = {"source_key": source_key, "frequency": frequency, "tab_id": "file"}
+            st.session_state["file_cached_df"] = df
+            st.session_state["file_cached_meta"] = meta
+            return df, meta
+
+    # Return previously processed data so results survive widget interactions
+    # (e.g. preparing the Excel export) without re-processing.
+    if "file_cached_df" in st.session_state and "file_cached_meta" in st.session_state:
+        return st.session_state["file_cached_df"], st.session_state["file_cached_meta"]
 
-            logger.info("Archival data ready: %d rows × %d columns", len(df), len(df.columns))
-            return df, {"source_key": source_key, "frequency": frequency, "tab_id": "file"}
     return None, {}